@@ -116,6 +116,10 @@ class Log:
     def getLevel(self):
         return self.__level
 
+    # check if messages of mode are logged
+    def isEnabledFor(self, mode):
+        return mode <= self.__level
+
     # clear log
     def clear(self):
         self.__LOG = []
@@ -250,6 +254,7 @@ _inst = Log()
 
 setLevel    = _inst.setLevel
 getLevel    = _inst.getLevel
+isEnabledFor= _inst.isEnabledFor
 useColor    = _inst.useColor
 enableOutput  = _inst.enableOutput
 disableOutput = _inst.disableOutput
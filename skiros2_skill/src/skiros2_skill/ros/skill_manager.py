@@ -11,13 +11,30 @@ from .discovery_interface import DiscoverableNode
 import skiros2_common.tools.logger as log
 from skiros2_common.core.world_element import Element
 from skiros2_common.tools.id_generator import IdGen
-from multiprocessing.dummy import Process
+from threading import Condition, Event, Lock, Thread
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 import skiros2_skill.core.visitors as visitors
 from std_msgs.msg import Empty, Bool
 import inflection  # For camel-snake case conversion
+import traceback
+import time
 
 log.setLevel(log.INFO)
 
+_camelized = dict()
+
+
+def _camelize(name):
+    """
+    @brief Memoized inflection.camelize
+    """
+    if name not in _camelized:
+        _camelized[name] = inflection.camelize(name)
+    return _camelized[name]
+
 
 def skill2msg(skill):
     msg = msgs.ResourceDescription()
@@ -36,66 +53,128 @@ class BtTicker:
     Provides interfaces to start, pause, stop the ticking process and to add/remove tasks
     """
     _verbose = True
-    _tasks_to_preempt = list()
-    _tasks_to_pause = dict()
+    _tasks_to_preempt = set()
     _tasks = {}
-    _process = None
+    _task_list = []
+    _worker = None
+    _active = False
     _visitor = None
+    _printer = None
     _id_gen = IdGen()
+    _wake_cv = Condition()
+    _wake_requested = False
+    _max_period = 1.0 / 25
 
     _progress_cb = None
+    _progress_observed_cb = None
     _tick_cb = None
 
     _finished_skill_ids = dict()
 
-    def _run(self, _):
+    def __init__(self):
+        if BtTicker._worker is None:
+            BtTicker._worker = Thread(target=self._run_forever)
+            BtTicker._worker.daemon = True
+            BtTicker._worker.start()
+
+    def _run_forever(self):
+        """
+        @brief Wait for an execution to be started and run it. Loops until the node shuts down
+        """
+        while True:
+            with BtTicker._wake_cv:
+                while not BtTicker._active:
+                    BtTicker._wake_cv.wait()
+            try:
+                self._run()
+            except Exception:
+                log.error("[BtTicker]", "Execution stopped by an exception:\n{}".format(traceback.format_exc()))
+                with BtTicker._wake_cv:
+                    BtTicker._active = False
+                    BtTicker._wake_cv.notify_all()
+
+    def _run(self):
         """
-        @brief Tick tasks at 25hz
+        @brief Tick tasks at 25hz, or earlier when woken up by a state change
         """
         BtTicker._finished_skill_ids = dict()
-        rate = rospy.Rate(25)
         log.info("[BtTicker]", "Execution starts.")
-        while BtTicker._tasks:
+        while True:
+            with BtTicker._wake_cv:
+                if not BtTicker._tasks:
+                    BtTicker._active = False
+                    BtTicker._wake_cv.notify_all()
+                    break
+            deadline = rospy.get_time() + BtTicker._max_period
             self._tick()
-            rate.sleep()
+            with BtTicker._wake_cv:
+                # Sleep for the rest of the tick period (ROS time), unless woken up
+                while not BtTicker._wake_requested:
+                    remaining = deadline - rospy.get_time()
+                    if remaining <= 0 or remaining > BtTicker._max_period:  # Elapsed, or time jumped backwards
+                        break
+                    BtTicker._wake_cv.wait(remaining)
+                BtTicker._wake_requested = False
             self._tick_cb()
         log.info("[BtTicker]", "Execution stops.")
 
+    def wake(self):
+        """
+        @brief Wake up the ticking thread, without waiting for the end of the tick period
+        """
+        with BtTicker._wake_cv:
+            BtTicker._wake_requested = True
+            BtTicker._wake_cv.notify_all()
+
     def _tick(self):
         visitor = BtTicker._visitor
-        printer = visitors.VisitorPrint(BtTicker._visitor._wm, BtTicker._visitor._instanciator)
-        for uid in list(BtTicker._tasks.keys()):
+        printer = BtTicker._printer
+        printer.reset_memory()
+        publish = self._progress_observed_cb is None or self._progress_observed_cb()
+        for uid, t in BtTicker._task_list:
+            if t._cancelled:
+                continue
             if uid in BtTicker._tasks_to_preempt:
-                BtTicker._tasks_to_preempt.remove(uid)
+                BtTicker._tasks_to_preempt.discard(uid)
                 visitor.preempt()
-            if uid in BtTicker._tasks_to_pause.keys():
-                if BtTicker._tasks_to_pause[uid] > 0:
-                    BtTicker._tasks_to_pause[uid] -= 1
-                else:
-                    continue
-            t = BtTicker._tasks[uid]
+            pause_ticks = t._pause_ticks
+            if pause_ticks < 0:
+                continue
+            if pause_ticks > 0:
+                t._pause_ticks = pause_ticks - 1 if pause_ticks > 1 else -1
             result = visitor.traverse(t)
-            printer.traverse(t)
-            self.publish_progress(uid, printer)
-            if result != State.Running and result != State.Idle:
+            finished = result != State.Running and result != State.Idle
+            if publish or finished:
+                printer.traverse(t)
+                self.publish_progress(uid, printer, result)
+            if finished:
                 self.remove_task(uid)
 
-    def kill(self):
-        if BtTicker._process is not None:
-            del BtTicker._process
-            BtTicker._process = None
-            self._tick()
+    def kill(self, uid):
+        """
+        @brief Remove a task without waiting for the ticking thread. The task is not ticked anymore
+        """
+        t = BtTicker._tasks.get(uid)
+        if t is not None:
+            t._cancelled = True
+            self.remove_task(uid)
+        self.wake()
 
     def is_running(self):
-        if BtTicker._process is None:
-            return False
-        return BtTicker._process.is_alive()
+        return BtTicker._active
 
-    def publish_progress(self, uid, visitor):
-        self._progress_cb(task_id=uid, tree=visitor.snapshot())
+    def publish_progress(self, uid, visitor, state):
+        self._progress_cb(task_id=uid, tree=visitor.snapshot(), state=state)
 
-    def observe_progress(self, func):
+    def observe_progress(self, func, is_observed=None):
+        """
+        @brief Set the progress callback
+
+        @param is_observed Optional predicate. When it returns False, the progress is neither collected nor published,
+                           except for the last tick of a task
+        """
         self._progress_cb = func
+        self._progress_observed_cb = is_observed
 
     def observe_tick(self, func):
         self._tick_cb = func
@@ -103,56 +182,85 @@ class BtTicker:
     def clear(self):
         if BtTicker._visitor:
             BtTicker._visitor.preempt()
-            BtTicker._process.join()
+            self.join()
             BtTicker._visitor = None
         BtTicker._tasks.clear()
+        BtTicker._tasks_to_preempt.clear()
+        BtTicker._task_list = []
         BtTicker._id_gen.clear()
 
     def add_task(self, obj, desired_id=-1):
         uid = BtTicker._id_gen.getId(desired_id)
         obj._label = "task_{}".format(uid)
+        obj._cancelled = False
+        obj._pause_ticks = 0  # 0: not paused, -1: paused, n > 0: paused after n ticks
+        obj._done = Event()
         BtTicker._tasks[uid] = obj
+        BtTicker._task_list = list(BtTicker._tasks.items())
+        self.wake()
         return uid
 
     def remove_task(self, uid):
-        BtTicker._tasks.pop(uid)
+        t = BtTicker._tasks.pop(uid, None)
+        if t is None:
+            return
+        BtTicker._tasks_to_preempt.discard(uid)
+        BtTicker._task_list = list(BtTicker._tasks.items())
         BtTicker._id_gen.removeId(uid)
+        t._done.set()
 
     def start(self, visitor, uid):
-        if uid in BtTicker._tasks_to_pause:
+        t = BtTicker._tasks.get(uid)
+        if t is not None and t._pause_ticks != 0:
             log.info("[start]", "Resuming task {}.".format(uid))
-            del BtTicker._tasks_to_pause[uid]
+            t._pause_ticks = 0
+            self.wake()
         else:
             log.info("[start]", "Starting task {}.".format(uid))
-        if not self.is_running():
-            BtTicker._visitor = visitor
-            BtTicker._process = Process(target=BtTicker._run, args=(self, True))
-            BtTicker._process.start()
-            return True
+        with BtTicker._wake_cv:
+            if not BtTicker._active:
+                BtTicker._visitor = visitor
+                BtTicker._printer = visitors.VisitorPrint(visitor._wm, visitor._instanciator)
+                BtTicker._active = True
+                BtTicker._wake_cv.notify_all()
+                return True
 
     def join(self):
-        BtTicker._process.join()
+        """
+        @brief Wait for the execution to stop
+        """
+        with BtTicker._wake_cv:
+            while BtTicker._active:
+                BtTicker._wake_cv.wait()
 
     def pause(self, uid):
         log.info("[pause]", "Pausing task {}.".format(uid))
-        BtTicker._tasks_to_pause[uid] = 0
+        t = BtTicker._tasks.get(uid)
+        if t is not None:
+            t._pause_ticks = -1
+            self.wake()
 
     def tick_once(self, uid):
         log.info("[tick_once]", "Tick once task {}.".format(uid))
-        BtTicker._tasks_to_pause[uid] = 1
+        t = BtTicker._tasks.get(uid)
+        if t is not None:
+            t._pause_ticks = 1
+            self.wake()
 
     def preempt(self, uid):
         log.info("[preempt]", "Stopping task {}...".format(uid))
-        if uid in BtTicker._tasks_to_pause:
-            del BtTicker._tasks_to_pause[uid]
-        BtTicker._tasks_to_preempt.append(uid)
-        starttime = rospy.Time.now()
-        timeout = rospy.Duration(5.0)
-        while(self.is_running() and rospy.Time.now() - starttime < timeout):
-            rospy.sleep(0.01)
-        if self.is_running():
-            log.info("preempt", "Task {} is not answering. Killing process.".format(uid))
-            self.kill()
+        t = BtTicker._tasks.get(uid)
+        if t is None:
+            log.info("preempt", "Task {} is not running.".format(uid))
+            return
+        t._pause_ticks = 0
+        BtTicker._tasks_to_preempt.add(uid)
+        self.wake()
+        if not self.is_running():
+            self.kill(uid)
+        elif not t._done.wait(5.0):
+            log.info("preempt", "Task {} is not answering. Killing it.".format(uid))
+            self.kill(uid)
         log.info("preempt", "Task {} preempted.".format(uid))
 
     def preempt_all(self):
@@ -175,6 +283,7 @@ class SkillManager:
 
     def __init__(self, prefix, agent_name, verbose=True):
         self._agent_name = agent_name
+        self._agent_short = agent_name.rpartition(":")[2]
         self._wmi = wmi.WorldModelInterface(agent_name, make_cache=True)
         self._wmi.set_default_prefix(prefix)
         self._local_wm = self._wmi
@@ -184,14 +293,16 @@ class SkillManager:
         self._ticker._verbose = verbose
         self._register_agent(agent_name)
         self._skills = []
+        self._skills_by_name = dict()
+        self._known_types = set()
         # self._wmi.unlock() #Ensures the world model's mutex is unlocked
 
     @property
     def skills(self):
         return self._skills
 
-    def observe_task_progress(self, func):
-        self._ticker.observe_progress(func)
+    def observe_task_progress(self, func, is_observed=None):
+        self._ticker.observe_progress(func, is_observed)
 
     def observe_tick(self, func):
         self._ticker.observe_tick(func)
@@ -212,7 +323,7 @@ class SkillManager:
                 self._wmi.set_relation(self._robot._id, "skiros:at", start_location._id)
                 self._robot = self._wmi.get_element(self._robot.id)
         log.info("[{}]".format(self.__class__.__name__), "Registered robot {}".format(self._robot))
-        self._robot.setProperty("skiros:SkillMgr", self._agent_name[self._agent_name.rfind(":") + 1:])
+        self._robot.setProperty("skiros:SkillMgr", self._agent_short)
         self._wmi.update_element(self._robot)
 
     def shutdown(self):
@@ -230,6 +341,10 @@ class SkillManager:
         """
         @brief Add a skill to the available skill set
         """
+        if name in self._skills_by_name:
+            log.warn("[SkillManager]", "Skill {} already added, skipping.".format(name))
+            skill = self._skills_by_name[name]
+            return SkillHolder(self._agent_name, skill.type, skill.label, skill.params.getCopy())
         skill = self._instanciator.add_instance(name)
         e = skill.toElement()
         e.addRelation(self._robot._id, "skiros:hasSkill", "-1")
@@ -238,12 +353,16 @@ class SkillManager:
         for c1, c2 in zip([None] + hierarchy[:-1], hierarchy):
             if c1 is None:
                 c1 = "skiros:Skill"
-            c1 = c1 if c1.find(":") > 0 else "skiros:{}".format(inflection.camelize(c1))
-            c2 = c2 if c2.find(":") > 0 else "skiros:{}".format(inflection.camelize(c2))
+            c1 = c1 if c1.find(":") > 0 else "skiros:{}".format(_camelize(c1))
+            c2 = c2 if c2.find(":") > 0 else "skiros:{}".format(_camelize(c2))
+            if c2 in self._known_types:
+                continue
             if not self._wmi.get_type(c2):
                 self._wmi.add_class(c2, c1)
+            self._known_types.add(c2)
         self._wmi.add_element(e)
         self._skills.append(skill)
+        self._skills_by_name[name] = skill
         return SkillHolder(self._agent_name, skill.type, skill.label, skill.params.getCopy())
 
     def add_primitive(self, name):
@@ -345,6 +464,21 @@ class SkillManager:
             raise e
 
 
+class MonitorListener(rospy.SubscribeListener):
+    """
+    @brief Keeps the skill manager node informed about the subscribers to ~monitor
+    """
+
+    def __init__(self, node):
+        self._node = node
+
+    def peer_subscribe(self, topic_name, topic_publish, peer_publish):
+        self._node._on_monitor_subscribe()
+
+    def peer_unsubscribe(self, topic_name, num_peers):
+        self._node._on_monitor_unsubscribe(num_peers)
+
+
 class SkillManagerNode(DiscoverableNode):
     """
     At boot:
@@ -361,24 +495,43 @@ class SkillManagerNode(DiscoverableNode):
     def __init__(self):
         rospy.init_node("skill_mgr", anonymous=False)
         self.publish_runtime_parameters = False
+        self._params = rospy.get_param('~', {})
+        self._bundle_size = self._params.get('progress_bundle_size', 1)
+        self._bundle_max_age = self._params.get('progress_bundle_max_age', 0.5)
+        self._pending = msgs.TreeProgress()
+        self._pending_updates = 0
+        self._pending_since = 0.0
+        self._msg_pool = []
+        self._last_snapshot = {}
+        self._serialized_params = {}
+        self._monitor_subs_count = 0
+        self._monitor_subs_lock = Lock()
+        self._monitor_resend = False
+        self._progress_q = queue.Queue(maxsize=1)
         robot_name = rospy.get_name()
-        prefix = ""
-        full_name = rospy.get_param('~prefix', prefix) + ':' + robot_name[robot_name.rfind("/") + 1:]
-        self.sm = SkillManager(rospy.get_param('~prefix', prefix), full_name, verbose=rospy.get_param('~verbose', True))
-        self.sm.observe_task_progress(self._on_progress_update)
+        prefix = self._params.get('prefix', "")
+        full_name = prefix + ':' + robot_name.rpartition("/")[2]
+        self.sm = SkillManager(prefix, full_name, verbose=self._params.get('verbose', True))
+        self.sm.observe_task_progress(self._on_progress_update, self._has_monitor_subscribers)
         self.sm.observe_tick(self._on_tick)
 
         # Init skills
-        self._initialized = False
+        self._initialized = Event()
+        self._descriptions_cache = None
+        self._descriptions_lock = Lock()
         self._getskills = rospy.Service('~get_skills', srvs.ResourceGetDescriptions, self._get_descriptions_cb)
         self._init_skills()
         rospy.sleep(0.5)
-        self._initialized = True
+        self._initialized.set()
 
         # Start communications
         self._command = rospy.Service('~command', srvs.SkillCommand, self._command_cb)
-        self._monitor = rospy.Publisher("~monitor", msgs.TreeProgress, queue_size=20)
+        self._monitor = rospy.Publisher("~monitor", msgs.TreeProgress, queue_size=20,
+                                        subscriber_listener=MonitorListener(self))
         self._tick_rate = rospy.Publisher("~tick_rate", Empty, queue_size=20)
+        self._progress_thread = Thread(target=self._progress_worker)
+        self._progress_thread.daemon = True
+        self._progress_thread.start()
         self._set_debug = rospy.Subscriber('~set_debug', Bool, self._set_debug_cb)
         rospy.on_shutdown(self.shutdown)
         self.init_discovery("skill_managers", robot_name)
@@ -391,19 +544,22 @@ class SkillManagerNode(DiscoverableNode):
         """
         @brief Initialize the robot with a set of skills
         """
-        for r in rospy.get_param('~libraries_list', []):
+        for r in self._params.get('libraries_list', []):
             log.info("[LoadLibrary]", str(r))
             self.sm.load_skills(r)
 
-        for r in rospy.get_param('~primitive_list', []):
+        for r in self._params.get('primitive_list', []):
             log.info("[LoadPrimitive]", str(r))
             self.sm.add_primitive(r)
 
-        sl = rospy.get_param('~skill_list', [])
+        sl = self._params.get('skill_list', [])
         for r in sl:
             log.info("[LoadSkill]", str(r))
             self.sm.add_skill(r)
 
+        with self._descriptions_lock:
+            self._descriptions_cache = None
+
     def _make_task(self, msg):
         task = []
         for s in msg:
@@ -439,25 +595,147 @@ class SkillManagerNode(DiscoverableNode):
         """
         self._tick_rate.publish(Empty())
 
+    def _on_monitor_subscribe(self):
+        """
+        @brief Called when a subscriber connects to ~monitor
+        """
+        with self._monitor_subs_lock:
+            self._monitor_subs_count += 1
+            # The new subscriber must receive the whole tree at least once
+            self._monitor_resend = True
+
+    def _on_monitor_unsubscribe(self, num_peers):
+        """
+        @brief Called when a subscriber disconnects from ~monitor
+        """
+        with self._monitor_subs_lock:
+            self._monitor_subs_count = num_peers
+
+    def _has_monitor_subscribers(self):
+        """
+        @brief Returns True if someone is listening to the task progress. Called at every tick
+        """
+        return self._monitor_subs_count > 0
+
+    def _snapshot_signature(self, tree):
+        """
+        @brief Returns a lightweight signature of a progress tree, used to detect changes between ticks
+        """
+        return {idd: hash((desc['state'], desc['code'], desc['msg'],
+                           desc['params'][0] if desc['params'] is not None else None))
+                for (idd, desc) in tree}
+
+    def _serialize_params(self, task_id, idd, params):
+        """
+        @brief Serialize the runtime parameters of a skill, reusing the last result if the parameters did not change
+
+        @return (time of the last parameter update, serialized parameters)
+        """
+        stamp = max([p.last_update for p in params.values()] or [None])
+        cached = self._serialized_params.get((task_id, idd))
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, utils.serializeParamMap(params))
+            self._serialized_params[(task_id, idd)] = cached
+        return cached
+
     def _on_progress_update(self, *args, **kwargs):
         """
-        @brief Publish all skill progress
+        @brief Queue the skill progress for publishing. Called from the ticking thread
+
+        Only the latest progress is kept if the publisher lags behind, so the ticking is never slowed down.
+        The end of a task is never dropped.
+
+        The snapshot shares the parameter values with the running skills, so the runtime parameters are
+        serialized here, before leaving the ticking thread.
         """
         task_id = kwargs['task_id']
         tree = kwargs['tree']
-        messages = msgs.TreeProgress()
-        for (idd, desc) in tree:
-            log.debug("[{}]".format(self.__class__.__name__),
-                      "{}:Task[{task_id}]{type}:{label}[{id}]: Message[{code}]: {msg} ({state})".format(
-                      self.sm._agent_name[1:], task_id=task_id, id=idd, **desc))
-            msg = msgs.SkillProgress()
-            msg.robot = rospy.get_name()
+        state = kwargs['state']
+        if self.publish_runtime_parameters:
+            for (idd, desc) in tree:
+                desc['params'] = self._serialize_params(task_id, idd, desc['params'])
+        else:
+            for (_, desc) in tree:
+                desc['params'] = None
+        if state != State.Running and state != State.Idle:
+            self._serialized_params = {k: v for k, v in self._serialized_params.items() if k[0] != task_id}
+        item = (task_id, tree, state)
+        try:
+            self._progress_q.put_nowait(item)
+        except queue.Full:
+            try:
+                pending = self._progress_q.get_nowait()
+            except queue.Empty:
+                pending = None
+            if pending is not None and pending[2] != State.Running and pending[2] != State.Idle:
+                self._progress_q.put_nowait(pending)
+                self._progress_q.put(item)
+            else:
+                self._progress_q.put_nowait(item)
+
+    def _progress_worker(self):
+        """
+        @brief Publish the queued skill progress
+        """
+        while True:
+            timeout = None
+            if self._pending_updates:
+                timeout = max(0.0, self._pending_since + self._bundle_max_age - time.time())
+            try:
+                item = self._progress_q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            try:
+                if item is None:
+                    self._flush_progress()
+                else:
+                    self._publish_progress(*item)
+            except Exception as e:
+                log.error("[{}]".format(self.__class__.__name__), "Failed to publish progress: {}".format(e))
+
+    def _publish_progress(self, task_id, tree, state):
+        """
+        @brief Publish the skill progress
+
+        Trees equal to the last one published for the same task are skipped. Up to ~progress_bundle_size
+        updates are gathered in a single message, for at most ~progress_bundle_max_age seconds. The end of a
+        task always flushes the pending message.
+        """
+        finished = state != State.Running and state != State.Idle
+        with self._monitor_subs_lock:
+            resend, self._monitor_resend = self._monitor_resend, False
+        if resend:
+            self._last_snapshot.clear()
+        if finished:
+            self._last_snapshot.pop(task_id, None)
+        else:
+            signature = self._snapshot_signature(tree)
+            if signature == self._last_snapshot.get(task_id):
+                self._flush_progress()
+                return
+            self._last_snapshot[task_id] = signature
+        messages = self._pending
+        progress = messages.progress
+        # SkillProgress messages are recycled: publish() serializes them before returning
+        pool = self._msg_pool
+        if len(pool) < len(progress) + len(tree):
+            pool.extend(msgs.SkillProgress() for _ in range(len(progress) + len(tree) - len(pool)))
+        robot_name = rospy.get_name()
+        append = progress.append
+        agent_name = self.sm._agent_short
+        debug = log.isEnabledFor(log.DEBUG)
+        for i, (idd, desc) in enumerate(tree, len(progress)):
+            if debug:
+                log.debug("[{}]".format(self.__class__.__name__),
+                          "{}:Task[{task_id}]{type}:{label}[{id}]: Message[{code}]: {msg} ({state})".format(
+                          agent_name, task_id=task_id, id=idd, **desc))
+            msg = pool[i]
+            msg.robot = robot_name
             msg.task_id = task_id
             msg.id = idd
             msg.type = desc['type']
             msg.label = desc['label']
-            if self.publish_runtime_parameters:
-                msg.params = utils.serializeParamMap(desc['params'])
+            msg.params = desc['params'][1] if desc['params'] is not None else []
             msg.state = desc['state'].value
             msg.processor = desc['processor']
             msg.parent_label = desc['parent_label']
@@ -466,20 +744,38 @@ class SkillManagerNode(DiscoverableNode):
             msg.progress_period = desc['period']
             msg.progress_time = desc['time']
             msg.progress_message = desc['msg']
+            append(msg)
+        if not self._pending_updates:
+            self._pending_since = time.time()
+        self._pending_updates += 1
+        self._flush_progress(force=finished)
 
-            messages.progress.append(msg)
-        self._monitor.publish(messages)
+    def _flush_progress(self, force=False):
+        """
+        @brief Publish the pending progress if the bundle is full or too old, or if force is True
+        """
+        if not self._pending_updates:
+            return
+        if force or self._pending_updates >= self._bundle_size \
+                or time.time() - self._pending_since >= self._bundle_max_age:
+            try:
+                self._monitor.publish(self._pending)
+            finally:
+                del self._pending.progress[:]
+                self._pending_updates = 0
 
     def _get_descriptions_cb(self, msg):
         """
         @brief Returns available skills. Called when receiving a command on ~/get_descriptions
         """
-        while not self._initialized:
-            rospy.sleep(0.1)
-        to_ret = srvs.ResourceGetDescriptionsResponse()
-        for s in self.sm.skills:
-            to_ret.list.append(skill2msg(s))
-        return to_ret
+        self._initialized.wait()
+        with self._descriptions_lock:
+            if self._descriptions_cache is None:
+                to_ret = srvs.ResourceGetDescriptionsResponse()
+                for s in self.sm.skills:
+                    to_ret.list.append(skill2msg(s))
+                self._descriptions_cache = to_ret
+            return self._descriptions_cache
 
     def shutdown(self):
         self.sm.shutdown()
@@ -180,11 +180,15 @@ class SkillManagerInterface:
         pass  # self._tick_rate.set_msg_t0(rospy.get_rostime().to_sec())
 
     def _progress_cb(self, msg):
-        root = [r for r in msg.progress if r.type.find("Root") >= 0]
-        if root:
-            self._active_tasks.add(int(root[-1].task_id))
-            if abs(root[-1].progress_code) == 1:
-                self._active_tasks.remove(int(root[-1].task_id))
+        root = None
+        for r in reversed(msg.progress):
+            if "Root" in r.type:
+                root = r
+                break
+        if root is not None:
+            self._active_tasks.add(int(root.task_id))
+            if abs(root.progress_code) == 1:
+                self._active_tasks.remove(int(root.task_id))
         if self._monitor_cb:
             self._monitor_cb(msg)
 